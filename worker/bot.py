@@ -1,7 +1,17 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
-import json
+import atexit
+import orjson
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import firebase_admin
 from firebase_admin import credentials, firestore
@@ -10,290 +20,590 @@ from firebase_admin import credentials, firestore
 API_KEY = os.getenv("API_KEY")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+TELEGRAM_URL = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
 FIREBASE_CREDENTIALS_JSON_STRING = os.getenv("FIREBASE_CREDENTIALS_JSON")
 
+# Hot-path detail is logged at DEBUG so it costs nothing unless LOG_LEVEL=DEBUG.
+# Records are handed to a queue and written to stderr by a listener thread, so a slow log pipe never blocks a cycle.
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+log_listener = QueueListener(queue.Queue(), log_stream_handler)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(message)s",  # Timestamp and level are added by the listener's handler
+    handlers=[QueueHandler(log_listener.queue)]
+)
+log_listener.start()
+atexit.register(log_listener.stop)
+log = logging.getLogger("bot")
+
 HEADERS = {'x-apisports-key': API_KEY}
 BASE_URL = 'https://v3.football.api-sports.io'
+MAX_FETCH_WORKERS = 16
+RATE_LIMIT_ATTEMPTS = 3  # Requests per API call before giving up on repeated 429s
+RATE_LIMIT_BACKOFF_BASE = 1  # Seconds; decorrelated-jitter backoff floor for concurrent chunk fetches
+RATE_LIMIT_BACKOFF_CAP = 120  # Seconds; longest jittered chunk sleep, unless Retry-After asks for more
+# No bet can reach full time sooner than this after being placed
+RESOLVE_MIN_AGE = timedelta(minutes=15)
+# Regular bets are placed at 36', so their match is at least an hour from FT
+BET_MIN_AGES = {'regular': timedelta(minutes=60)}
+# Bets still without an FT result after this long are closed out as expired
+STALE_BET_AGE = timedelta(hours=6)
+TRACKED_CACHE_SIZE = 2000  # Matches whose state is kept in memory
+MAX_BATCH_OPS = 500  # Firestore limit on writes per batch
+POLL_INTERVAL = 90  # 1.5 minutes between cycle starts when a cycle fails
+MIN_POLL_INTERVAL = 30  # Poll this often while a match is in or about to enter a bet window
+MAX_POLL_INTERVAL = 120  # Longest gap between polls; guarantees a poll inside every 3-minute bet window
+HEALTH_CHECK_INTERVAL = 1800  # 30 minutes between "bot is active" notifications
+
+DEFAULT_MATCH_STATE = {
+    '36_bet_placed': False,
+    '36_result_checked': False,
+    '36_bet_won': None,
+    '80_bet_placed': False,
+    '36_score': None,
+    'ht_score': None
+}
+
+LIVE_STATUSES = frozenset({'LIVE', 'HT', '1H', '2H'})
+VALID_36_SCORES = frozenset({'0-0', '1-1', '2-2', '3-3'})  # Scores to bet on at 36'
+
+def create_session(pool_maxsize=32):
+    """Create a keep-alive session with connection pooling and transient-error retries"""
+    session = requests.Session()
+    retries = Retry(
+        total=2,
+        backoff_factor=0.3,
+        # 429s are left to api_get/handle_api_rate_limit, so a rate-limited call isn't retried by two layers
+        status_forcelist=[500, 502, 503, 504],
+        raise_on_status=False  # Hand the final response back so callers log the real status
+    )
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retries))
+    return session
+
+# Validators and body of the last /fixtures?live=all response, for conditional GETs
+LIVE_MATCHES_CACHE = {'etag': None, 'last_modified': None, 'matches': []}
+
+NOT_FINISHED_TTL = 300  # Seconds before re-checking a fixture that wasn't FT yet
+NOT_FINISHED_CACHE = {}
+
+TELEGRAM_MAX_LENGTH = 4096  # Telegram's sendMessage text limit
+TELEGRAM_SEPARATOR = "\n\n---\n\n"
+TELEGRAM_OUTBOX = []
+TELEGRAM_QUEUE = queue.Queue()
+
+# Telegram message templates
+MSG_36_BET = "⏱️ 36' - {match_name}\n🏆{league_name} ({country})\n🔢 Score: {score}\n🎯 Correct Score Bet Place"
+MSG_HT_WON = "✅ HT Result: {match_name}\n🏆 {league_name} ({country})\n🔢 Score: {score}\n🎉 36' Bet WON"
+MSG_HT_LOST = "❌ HT Result: {match_name}\n🏆 {league_name} ({country})\n🔢 Score: {score}\n🔁 36' Bet LOST — eligible for chase"
+MSG_80_CHASE_BET = (
+    "⏱️ 80' CHASE BET: {match_name}\n"
+    "🏆 {league_name} ({country})\n"
+    "🔢 Score: {score}\n"
+    "🎯 Betting for Correct Score\n"
+    "💡 Covering lost 36' bet ({score_36} -> {ht_score})"
+)
+MSG_CHASE_WON = (
+    "✅ CHASE BET WON: {match_name}\n"
+    "🏆 {league_name} ({country})\n"
+    "🔢 Final Score: {score}\n"
+    "🎉 Same as 80' score\n"
+    "💡 Covered 36' loss ({score_36} -> {ht_score})"
+)
+MSG_CHASE_LOST = (
+    "❌ CHASE BET LOST: {match_name}\n"
+    "🏆 {league_name} ({country})\n"
+    "🔢 Final Score: {score} (was {score_80} at 80')\n"
+    "📉 Score changed after 80'\n"
+    "💡 Failed to cover 36' loss ({score_36} -> {ht_score})"
+)
+MSG_FT_REGULAR_UNRESOLVED = "⚠️ FT Result: {match_name}\n🏆 {league_name} ({country})\n🔢 Score: {score}\n❓ Regular bet was not resolved at HT. Marked as error."
+MSG_BET_EXPIRED = "⌛ Bet expired: {match_name}\n🏆 {league_name} ({country})\n❓ No FT result after {hours}h. Marked as expired."
+MSG_FT_UNKNOWN_BET = "⚠️ FT Result: {match_name}\n🏆 {league_name} ({country})\n🔢 Score: {score}\n❓ Unknown bet type: {bet_type}"
+
+# Shared sessions reuse TCP/TLS connections across calls and cycles
+API_SESSION = create_session()
+API_SESSION.headers.update(HEADERS)
+TG_SESSION = create_session(pool_maxsize=4)
 
 class FirebaseManager:
     """Manages all interactions with the Firebase Firestore database."""
     def __init__(self, credentials_json_string):
         try:
-            print("[DEBUG] Initializing Firebase...")
-            if not credentials_json_string:
-                raise ValueError("FIREBASE_CREDENTIALS_JSON is empty. Please set the environment variable.")
-            cred_dict = json.loads(credentials_json_string)
-            cred = credentials.Certificate(cred_dict)
-            if not firebase_admin._apps:
+            log.debug("Initializing Firebase...")
+            try:
+                # Reuse the default app (and its gRPC channels) if this process already initialized it
+                firebase_admin.get_app()
+            except ValueError:
+                if not credentials_json_string:
+                    raise ValueError("FIREBASE_CREDENTIALS_JSON is empty. Please set the environment variable.")
+                cred_dict = orjson.loads(credentials_json_string)
+                cred = credentials.Certificate(cred_dict)
                 firebase_admin.initialize_app(cred)
             self.db = firestore.client()
-            print("✅ Firebase initialized successfully")
+            # Collection references are immutable, so build them once
+            self.collections = {
+                name: self.db.collection(name)
+                for name in ('tracked_matches', 'unresolved_bets', 'resolved_bets')
+            }
+            # In-process LRU copy of tracked_matches, kept in sync on every write
+            self.tracked_cache = OrderedDict()
+            log.info("✅ Firebase initialized successfully")
         except Exception as e:
-            print(f"❌ Failed to initialize Firebase: {e}")
+            log.error("❌ Failed to initialize Firebase: %s", e)
             raise
 
+    def cached_state(self, match_id):
+        """Return the cached state for a match (marking it recently used), or None on a miss"""
+        state = self.tracked_cache.get(str(match_id))
+        if state is not None:
+            self.tracked_cache.move_to_end(str(match_id))
+        return state
+
+    def cache_state(self, match_id, data):
+        """Merge data into the cached state for a match, evicting the least recently used entries"""
+        self.tracked_cache.setdefault(str(match_id), {}).update(data)
+        self.tracked_cache.move_to_end(str(match_id))
+        while len(self.tracked_cache) > TRACKED_CACHE_SIZE:
+            self.tracked_cache.popitem(last=False)
+
     def get_tracked_match(self, match_id):
-        doc_ref = self.db.collection('tracked_matches').document(str(match_id))
+        cached = self.cached_state(match_id)
+        if cached is not None:
+            return dict(cached)
+        doc_ref = self.collections['tracked_matches'].document(str(match_id))
         try:
             doc = doc_ref.get()
-            return doc.to_dict() if doc.exists else None
+            if not doc.exists:
+                return None
+            state = doc.to_dict()
+            self.cache_state(match_id, state)
+            return state
         except Exception as e:
-            print(f"❌ Firestore Error during get_tracked_match: {e}")
+            log.error("❌ Firestore Error during get_tracked_match: %s", e)
             return None
 
+    def get_tracked_matches(self, match_ids):
+        """Load uncached tracked_matches docs in one get_all round trip and cache them"""
+        states = {}
+        missing = []
+        for mid in match_ids:
+            cached = self.cached_state(mid)
+            if cached is None:
+                missing.append(str(mid))
+            else:
+                states[str(mid)] = dict(cached)
+        if missing:
+            refs = [self.collections['tracked_matches'].document(mid) for mid in missing]
+            try:
+                found = {snap.id: snap.to_dict() for snap in self.db.get_all(refs) if snap.exists}
+            except Exception as e:
+                # Leave the misses uncached so process_match falls back to a per-match read
+                log.error("❌ Firestore Error during get_tracked_matches: %s", e)
+                return states
+            for mid in missing:
+                # An empty entry records that the doc does not exist yet, so it is not read again
+                states[mid] = found.get(mid, {})
+                self.cache_state(mid, states[mid])
+        return states
+
     def update_tracked_match(self, match_id, data):
-        doc_ref = self.db.collection('tracked_matches').document(str(match_id))
+        doc_ref = self.collections['tracked_matches'].document(str(match_id))
         try:
             doc_ref.set(data, merge=True)
+            self.cache_state(match_id, data)
         except Exception as e:
-            print(f"❌ Firestore Error during update_tracked_match: {e}")
+            log.error("❌ Firestore Error during update_tracked_match: %s", e)
 
-    def get_unresolved_bets(self, bet_type=None):
-        try:
-            col_ref = self.db.collection('unresolved_bets')
-            if bet_type:
-                query = col_ref.where('bet_type', '==', bet_type)
-            else:
-                query = col_ref
-            bets = query.stream()
-            return {doc.id: doc.to_dict() for doc in bets}
-        except Exception as e:
-            print(f"❌ Firestore Error during get_unresolved_bets: {e}")
-            return {}
-    
-    def add_unresolved_bet(self, match_id, data):
+    def stream_unresolved_bets(self, placed_before=None):
+        """Yield unresolved bet snapshots lazily; callers call to_dict() only on the ones they use"""
         try:
-            self.db.collection('unresolved_bets').document(str(match_id)).set(data)
+            query = self.collections['unresolved_bets']
+            if placed_before:
+                # placed_at is an ISO-8601 UTC string, so lexicographic order matches time order
+                query = query.where(filter=firestore.FieldFilter('placed_at', '<=', placed_before.isoformat()))
+            yield from query.stream()
         except Exception as e:
-            print(f"❌ Firestore Error during add_unresolved_bet: {e}")
+            log.error("❌ Firestore Error during stream_unresolved_bets: %s", e)
 
-    def move_to_resolved(self, match_id, bet_info, outcome):
-        resolved_bet_ref = self.db.collection('resolved_bets').document(str(match_id))
+    def get_unresolved_bets_by_ids(self, match_ids):
+        """Read specific unresolved bets in one get_all round trip; None if the read failed"""
+        refs = [self.collections['unresolved_bets'].document(str(mid)) for mid in match_ids]
         try:
-            resolved_data = {
-                **bet_info,
-                'outcome': outcome,
-                'resolved_at': datetime.utcnow().isoformat()
-            } 
-            resolved_bet_ref.set(resolved_data)
-            self.db.collection('unresolved_bets').document(str(match_id)).delete()
+            return {snap.id: snap.to_dict() for snap in self.db.get_all(refs) if snap.exists}
         except Exception as e:
-            print(f"❌ Firestore Error during move_to_resolved: {e}")
+            log.error("❌ Firestore Error during get_unresolved_bets_by_ids: %s", e)
+            return None
+
+    def commit_batch(self, ops):
+        """Apply (collection, doc_id, data, merge) writes in as few commits as possible; data=None deletes the doc"""
+        for start in range(0, len(ops), MAX_BATCH_OPS):
+            chunk = ops[start:start + MAX_BATCH_OPS]
+            batch = self.db.batch()
+            for collection, doc_id, data, merge in chunk:
+                doc_ref = self.collections[collection].document(str(doc_id))
+                if data is None:
+                    batch.delete(doc_ref)
+                else:
+                    batch.set(doc_ref, data, merge=merge)
+            try:
+                batch.commit()
+            except Exception as e:
+                log.error("❌ Firestore Error during commit_batch: %s", e)
+                continue
+            for collection, doc_id, data, merge in chunk:
+                if collection == 'tracked_matches' and data is not None:
+                    self.cache_state(doc_id, data)
+
+    def resolution_ops(self, match_id, bet_info, outcome):
+        """Batch ops that move a bet from unresolved_bets to resolved_bets"""
+        resolved_data = {
+            **bet_info,
+            'outcome': outcome,
+            'resolved_at': firestore.SERVER_TIMESTAMP
+        }
+        return [
+            ('resolved_bets', match_id, resolved_data, False),
+            ('unresolved_bets', match_id, None, False),
+        ]
 
 # Initialize Firebase
 try:
     firebase_manager = FirebaseManager(FIREBASE_CREDENTIALS_JSON_STRING)
 except Exception as e:
-    print(f"❌ Critical Firebase initialization error: {e}")
+    log.critical("❌ Critical Firebase initialization error: %s", e)
     exit(1)
 
-def send_telegram(msg):
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
+def send_telegram_sync(msg):
     data = {'chat_id': TELEGRAM_CHAT_ID, 'text': msg}
     try:
-        response = requests.post(url, data=data, timeout=10)
+        response = TG_SESSION.post(TELEGRAM_URL, data=data, timeout=10)
         if response.status_code != 200:
-            print(f"❌ Telegram error: {response.text}")
+            log.error("❌ Telegram error: %s", response.text)
         return response
     except requests.exceptions.RequestException as e:
-        print(f"❌ Network Error sending Telegram message: {e}")
+        log.error("❌ Network Error sending Telegram message: %s", e)
         return None
 
-def handle_api_rate_limit(response):
-    """Handle API rate limiting by adjusting sleep time"""
-    if response.status_code == 429:
-        retry_after = int(response.headers.get('Retry-After', 60))
-        print(f"⏳ Rate limited. Sleeping for {retry_after} seconds")
-        time.sleep(retry_after)
-        return True
-    return False
+def telegram_worker():
+    """Deliver queued Telegram messages one at a time, in order"""
+    while True:
+        msg = TELEGRAM_QUEUE.get()
+        try:
+            send_telegram_sync(msg)
+        except Exception as e:
+            log.error("❌ Telegram worker error: %s", e)
+        finally:
+            TELEGRAM_QUEUE.task_done()
+
+def send_telegram(msg):
+    """Hand a message to the background sender so the cycle never waits on Telegram"""
+    TELEGRAM_QUEUE.put(msg)
+
+threading.Thread(target=telegram_worker, name="telegram-sender", daemon=True).start()
+
+def queue_telegram(msg):
+    """Hold a notification until the end of the cycle so it can be sent in a batch"""
+    TELEGRAM_OUTBOX.append(msg)
+
+def flush_telegram():
+    """Send queued notifications in order, packing as many as fit into each message"""
+    # Take only what is queued now: the background resolver may append while this runs
+    messages = TELEGRAM_OUTBOX[:]
+    del TELEGRAM_OUTBOX[:len(messages)]
+    batch = ""
+    for msg in messages:
+        candidate = f"{batch}{TELEGRAM_SEPARATOR}{msg}" if batch else msg
+        if batch and len(candidate) > TELEGRAM_MAX_LENGTH:
+            send_telegram(batch)
+            batch = msg
+        else:
+            batch = candidate
+    if batch:
+        send_telegram(batch)
+
+def handle_api_rate_limit(response, last_sleep=None, jitter=False):
+    """Sleep out a 429 for Retry-After, or with decorrelated jitter never below it; returns the seconds slept (0 if not rate limited)"""
+    if response.status_code != 429:
+        return 0
+    retry_after = int(response.headers.get('Retry-After', 60))
+    sleep_time = retry_after
+    if jitter:
+        # Concurrent chunk fetches get the same Retry-After; spreading the sleep up to 3x the previous one
+        # keeps them from retrying in lockstep
+        last_sleep = last_sleep or retry_after
+        sleep_time = max(retry_after, min(RATE_LIMIT_BACKOFF_CAP, random.uniform(RATE_LIMIT_BACKOFF_BASE, last_sleep * 3)))
+    log.warning("⏳ Rate limited. Sleeping for %.1f seconds", sleep_time)
+    time.sleep(sleep_time)
+    return sleep_time
+
+def api_get(url, jitter=False, **kwargs):
+    """GET from the API, sleeping out 429s up to RATE_LIMIT_ATTEMPTS times; returns the last response
+
+    jitter spreads the retries of requests issued in parallel; a lone request just honours Retry-After.
+    """
+    last_sleep = None
+    for attempt in range(1, RATE_LIMIT_ATTEMPTS + 1):
+        response = API_SESSION.get(url, **kwargs)
+        if response.status_code != 429 or attempt == RATE_LIMIT_ATTEMPTS:
+            return response
+        last_sleep = handle_api_rate_limit(response, last_sleep, jitter)
 
 def get_live_matches():
     """Fetch ONLY live matches from API"""
-    print("🔍 Fetching live matches...")
+    log.debug("🔍 Fetching live matches...")
     url = f"{BASE_URL}/fixtures?live=all"
+    
+    # Conditional GET: let the API answer 304 when nothing changed since the last poll
+    conditional_headers = {}
+    if LIVE_MATCHES_CACHE['etag']:
+        conditional_headers['If-None-Match'] = LIVE_MATCHES_CACHE['etag']
+    if LIVE_MATCHES_CACHE['last_modified']:
+        conditional_headers['If-Modified-Since'] = LIVE_MATCHES_CACHE['last_modified']
+    
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = api_get(url, headers=conditional_headers, timeout=15)
         
-        # Handle rate limiting
-        if handle_api_rate_limit(response):
-            return get_live_matches()  # Retry after sleep
+        if response.status_code == 304:
+            matches = LIVE_MATCHES_CACHE['matches']
+            log.info("✅ Live matches unchanged (%d)", len(matches))
+            return matches
         
         if response.status_code != 200:
-            print(f"❌ API ERROR: {response.status_code} - {response.text}")
+            log.error("❌ API ERROR: %s - %s", response.status_code, response.text)
             return []
             
-        data = response.json()
+        data = orjson.loads(response.content)
         matches = data.get('response', [])
-        print(f"✅ Found {len(matches)} live matches")
+        LIVE_MATCHES_CACHE.update(
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            matches=matches
+        )
+        log.info("✅ Found %d live matches", len(matches))
         return matches
     except Exception as e:
-        print(f"❌ API Error: {e}")
+        log.error("❌ API Error: %s", e)
         return []
 
+def fetch_fixture_chunk(chunk):
+    """Fetch one chunk of FINISHED fixtures, retrying only this chunk if rate limited; None on failure"""
+    ids_param = '-'.join(chunk)
+    url = f"{BASE_URL}/fixtures?ids={ids_param}&status=FT"  # Only finished matches
+    
+    try:
+        response = api_get(url, jitter=True, timeout=25)
+            
+        if response.status_code != 200:
+            log.error("❌ API ERROR: %s - %s", response.status_code, response.text)
+            return None
+            
+        data = orjson.loads(response.content)
+        # Quota and key errors come back as 200 with an empty response, so they must not read as "not finished"
+        if data.get('errors'):
+            log.error("❌ API ERROR: %s", data['errors'])
+            return None
+        return data.get('response', [])
+        
+    except Exception as e:
+        log.error("❌ Fixture Lookup Error for chunk: %s", e)
+        return None
+
 def get_fixtures_by_ids(match_ids):
-    """Fetch specific FINISHED fixtures by their IDs"""
+    """Fetch specific FINISHED fixtures by their IDs (Firestore document IDs, so already strings)
+
+    Returns (fixtures, checked): checked holds the ids a successful lookup covered, recently or now,
+    so an id in checked but not in fixtures is confirmed unfinished rather than unknown.
+    """
+    if not match_ids:
+        return {}, set()
+    
+    # Skip fixtures that recently came back unfinished
+    now = time.monotonic()
+    for mid, checked_at in list(NOT_FINISHED_CACHE.items()):
+        if now - checked_at >= NOT_FINISHED_TTL:
+            del NOT_FINISHED_CACHE[mid]
+    checked = {mid for mid in match_ids if mid in NOT_FINISHED_CACHE}
+    match_ids = [mid for mid in match_ids if mid not in NOT_FINISHED_CACHE]
     if not match_ids:
-        return {}
+        return {}, checked
     
-    print(f"🔍 Fetching {len(match_ids)} unresolved matches")
+    log.debug("🔍 Fetching %d unresolved matches", len(match_ids))
     
     # Split into chunks of 20 due to API limit
     chunk_size = 20
+    chunks = [match_ids[i:i+chunk_size] for i in range(0, len(match_ids), chunk_size)]
     fixtures = {}
     
-    for i in range(0, len(match_ids), chunk_size):
-        chunk = match_ids[i:i+chunk_size]
-        ids_param = '-'.join(str(mid) for mid in chunk)
-        url = f"{BASE_URL}/fixtures?ids={ids_param}&status=FT"  # Only finished matches
+    # Chunks are independent requests, so fetch them concurrently over the pooled session
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(chunks))) as executor:
+        results = list(executor.map(fetch_fixture_chunk, chunks))
+    
+    for chunk_number, (chunk, response_fixtures) in enumerate(zip(chunks, results), start=1):
+        if response_fixtures is None:
+            continue
+        checked.update(chunk)
+        for f in response_fixtures:
+            fixtures[str(f['fixture']['id'])] = f
         
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=25)
-            
-            # Handle rate limiting
-            if handle_api_rate_limit(response):
-                # Retry current chunk after sleep
-                return get_fixtures_by_ids(match_ids)
-                
-            if response.status_code != 200:
-                print(f"❌ API ERROR: {response.status_code} - {response.text}")
-                continue
-                
-            data = response.json()
-            response_fixtures = data.get('response', [])
+        # Only a successful lookup proves a fixture is not finished yet
+        for mid in chunk:
+            if mid not in fixtures:
+                NOT_FINISHED_CACHE[mid] = now
             
-            for f in response_fixtures:
-                fixtures[str(f['fixture']['id'])] = f
-                
-            print(f"✅ Retrieved {len(response_fixtures)} finished fixtures (chunk {i//chunk_size + 1})")
-            
-        except Exception as e:
-            print(f"❌ Fixture Lookup Error for chunk: {e}")
+        log.debug("✅ Retrieved %d finished fixtures (chunk %d)", len(response_fixtures), chunk_number)
     
-    return fixtures
+    return fixtures, checked
+
+def is_in_bet_window(status, minute):
+    """True when a live match is at HT or inside the 36'/80' windows; status must be upper-case"""
+    return status == 'HT' or 35 <= minute <= 37 or 79 <= minute <= 81
+
+def is_actionable_match(match):
+    """True when a live fixture has minute data and sits in a bet window"""
+    status = match['fixture']['status']
+    short = status['short'].upper()
+    return (
+        short in LIVE_STATUSES
+        and status['elapsed'] is not None
+        and is_in_bet_window(short, status['elapsed'])
+    )
 
-def process_match(match):
+def is_match_settled(state):
+    """True once a tracked match has no further bets to place or check"""
+    return bool(
+        state.get('36_result_checked')
+        and (state.get('80_bet_placed') or state.get('36_bet_won') is not False)
+    )
+
+def awaits_ht_result(state):
+    """True when a 36' decision was made but its HT result hasn't been checked"""
+    return bool(state.get('36_bet_placed') and not state.get('36_result_checked'))
+
+def process_match(match, ht_bets=None, placed_at=None):
+    """Apply the 36'/HT/80' strategy to one live match; ht_bets maps prefetched fixture ids to their unresolved bet (or None)"""
     fixture = match['fixture']
     teams = match['teams']
-    league = match['league']
-    goals = match['goals']
     
     fixture_id = fixture['id']
+    minute = fixture['status']['elapsed']
+    status = fixture['status']['short'].upper()
+    
+    # Skip non-live matches (case-insensitive check)
+    if status not in LIVE_STATUSES:
+        return
+        
+    # Skip matches without minute data
+    if minute is None:
+        log.debug("⚠️ Skipping %s vs %s - no minute data (status: %s)", teams['home']['name'], teams['away']['name'], status)
+        return
+    
+    # Only the 36', HT and 80' windows can change state, so skip everything else before touching Firestore
+    if not is_in_bet_window(status, minute):
+        return
+    
+    # Matches whose cached state is already settled need no Firestore read or write
+    cached_state = firebase_manager.cached_state(fixture_id)
+    if cached_state and is_match_settled(cached_state):
+        return
+    
+    league = match['league']
+    goals = match['goals']
     match_name = f"{teams['home']['name']} vs {teams['away']['name']}"
     league_name = league['name']
     league_id = league['id']
     country = league.get('country', 'N/A')
-    minute = fixture['status']['elapsed']
-    status = fixture['status']['short'] 
     
     # Handle possible None scores and minutes
     home_goals = goals['home'] if goals['home'] is not None else 0
     away_goals = goals['away'] if goals['away'] is not None else 0
     score = f"{home_goals}-{away_goals}"
     
-    # Skip non-live matches (case-insensitive check)
-    if status.upper() not in ['LIVE', 'HT', '1H', '2H']:
-        return
-        
-    # Skip matches without minute data
-    if minute is None:
-        print(f"⚠️ Skipping {match_name} - no minute data (status: {status})")
-        return
-    
-    #print(f"⚽ Processing: {match_name} ({minute}' {score}) [ID: {fixture_id}]")
+    log.debug("⚽ Processing: %s (%s' %s) [ID: %s]", match_name, minute, score, fixture_id)
+    if placed_at is None:
+        placed_at = datetime.utcnow().isoformat()
     
-    # Get or create match state
-    state = firebase_manager.get_tracked_match(fixture_id)
-    if not state:
-        state = {
-            '36_bet_placed': False,
-            '36_result_checked': False,
-            '36_bet_won': None,
-            '80_bet_placed': False,
-            '36_score': None,
-            'ht_score': None
-        }
-        firebase_manager.update_tracked_match(fixture_id, state)
-    else:
-        # Ensure all state keys exist
-        state.setdefault('36_bet_placed', False)
-        state.setdefault('36_result_checked', False)
-        state.setdefault('36_bet_won', None)
-        state.setdefault('80_bet_placed', False)
-        state.setdefault('36_score', None)
-        state.setdefault('ht_score', None)
+    # Get match state; new matches start from the defaults and are only written once something changes
+    state = {**DEFAULT_MATCH_STATE, **(firebase_manager.get_tracked_match(fixture_id) or {})}
 
     # ✅ Place 36' Bet (Widened window to 35-42 minutes)
-    if status.upper() == '1H' and 35 <= minute <= 37 and not state.get('36_bet_placed'):
-        print(f"🔍 Checking 36' bet for {match_name} at {minute}'")
+    if status == '1H' and 35 <= minute <= 37 and not state.get('36_bet_placed'):
+        log.debug("🔍 Checking 36' bet for %s at %s'", match_name, minute)
         state['36_score'] = score
         unresolved_data_base = {
             'match_name': match_name,
-            'placed_at': datetime.utcnow().isoformat(),
+            'placed_at': placed_at,
             'league': league_name,
             'country': country,
             'league_id': league_id,
         }
         
-        # Only place bets for 1-1, 2-2, or 3-3 scores
-        if score in ['0-0','1-1', '2-2', '3-3']:
-            print(f"✅ Placing Regular bet {match_name} - score {score}")
+        # Only place bets for 0-0, 1-1, 2-2, or 3-3 scores
+        if score in VALID_36_SCORES:
+            log.info("✅ Placing Regular bet %s - score %s", match_name, score)
             state['36_bet_placed'] = True
-            firebase_manager.update_tracked_match(fixture_id, state)
-            send_telegram(f"⏱️ 36' - {match_name}\n🏆{league_name} ({country})\n🔢 Score: {score}\n🎯 Correct Score Bet Place")
             unresolved_data = {**unresolved_data_base, 'bet_type': 'regular'}
-            firebase_manager.add_unresolved_bet(fixture_id, unresolved_data)
+            firebase_manager.commit_batch([
+                ('tracked_matches', fixture_id, {'36_score': score, '36_bet_placed': True}, True),
+                ('unresolved_bets', fixture_id, unresolved_data, False),
+            ])
+            queue_telegram(MSG_36_BET.format(match_name=match_name, league_name=league_name, country=country, score=score))
         else:
-            print(f"⛔ No 36' bet for {match_name} - score {score} not in strategy")
+            log.info("⛔ No 36' bet for %s - score %s not in strategy", match_name, score)
             # Mark as placed to avoid retrying
             state['36_bet_placed'] = True
-            firebase_manager.update_tracked_match(fixture_id, state)
+            firebase_manager.update_tracked_match(fixture_id, {'36_score': score, '36_bet_placed': True})
 
     # ✅ Check HT result for regular bets
-    if status.upper() == 'HT' and state.get('36_bet_placed') and not state.get('36_result_checked'):
+    if status == 'HT' and awaits_ht_result(state):
         current_score = score
         state['ht_score'] = current_score
-        unresolved_bet_data = firebase_manager.get_unresolved_bets('regular').get(str(fixture_id))
+        if ht_bets is None or str(fixture_id) not in ht_bets:
+            ht_bets = firebase_manager.get_unresolved_bets_by_ids([fixture_id])
+            if ht_bets is None:
+                # Firestore read failed; retry on the next cycle instead of marking the result checked
+                return
+        unresolved_bet_data = ht_bets.get(str(fixture_id))
+        if unresolved_bet_data and unresolved_bet_data.get('bet_type') != 'regular':
+            unresolved_bet_data = None
         
         if not unresolved_bet_data:
-            print(f"⚠️ No unresolved bet found for {match_name} at HT")
+            log.warning("⚠️ No unresolved bet found for %s at HT", match_name)
             state['36_result_checked'] = True
-            firebase_manager.update_tracked_match(fixture_id, state)
+            firebase_manager.update_tracked_match(fixture_id, {'ht_score': current_score, '36_result_checked': True})
             return
             
         if current_score == state.get('36_score', ''):
-            send_telegram(f"✅ HT Result: {match_name}\n🏆 {league_name} ({country})\n🔢 Score: {current_score}\n🎉 36' Bet WON")
+            queue_telegram(MSG_HT_WON.format(match_name=match_name, league_name=league_name, country=country, score=current_score))
             state['36_bet_won'] = True
-            firebase_manager.move_to_resolved(fixture_id, unresolved_bet_data, 'win')
+            outcome = 'win'
         else:
-            send_telegram(f"❌ HT Result: {match_name}\n🏆 {league_name} ({country})\n🔢 Score: {current_score}\n🔁 36' Bet LOST — eligible for chase")
+            queue_telegram(MSG_HT_LOST.format(match_name=match_name, league_name=league_name, country=country, score=current_score))
             state['36_bet_won'] = False
-            firebase_manager.move_to_resolved(fixture_id, unresolved_bet_data, 'lost')
+            outcome = 'lost'
             
         state['36_result_checked'] = True
-        firebase_manager.update_tracked_match(fixture_id, state)
+        firebase_manager.commit_batch([
+            *firebase_manager.resolution_ops(fixture_id, unresolved_bet_data, outcome),
+            ('tracked_matches', fixture_id, {
+                'ht_score': current_score,
+                '36_bet_won': state['36_bet_won'],
+                '36_result_checked': True
+            }, True),
+        ])
 
     # ✅ Place 80' Chase Bet (Widened window to 79-85 minutes)
-    if status.upper() == '2H' and 79 <= minute <= 81 and not state.get('80_bet_placed'):
+    if status == '2H' and 79 <= minute <= 81 and not state.get('80_bet_placed'):
         # Only place chase bet if 36' bet was lost
         if state.get('36_bet_won') is False:
-            print(f"🔍 Placing 80' chase bet for {match_name} at {minute}'")
+            log.info("🔍 Placing 80' chase bet for %s at %s'", match_name, minute)
             state['80_score'] = score
             state['80_bet_placed'] = True
-            firebase_manager.update_tracked_match(fixture_id, state)
-            
-            send_telegram(
-                f"⏱️ 80' CHASE BET: {match_name}\n"
-                f"🏆 {league_name} ({country})\n"
-                f"🔢 Score: {score}\n"
-                f"🎯 Betting for Correct Score\n"
-                f"💡 Covering lost 36' bet ({state['36_score']} -> {state['ht_score']})"
-            )
             
             # Create unresolved bet for chase
             unresolved_data = {
                 'match_name': match_name,
-                'placed_at': datetime.utcnow().isoformat(),
+                'placed_at': placed_at,
                 'league': league_name,
                 'country': country,
                 'league_id': league_id,
@@ -302,33 +612,113 @@ def process_match(match):
                 'ht_score': state['ht_score'],
                 '80_score': score
             }
-            firebase_manager.add_unresolved_bet(fixture_id, unresolved_data)
+            firebase_manager.commit_batch([
+                ('tracked_matches', fixture_id, {'80_score': score, '80_bet_placed': True}, True),
+                ('unresolved_bets', fixture_id, unresolved_data, False),
+            ])
+            
+            queue_telegram(MSG_80_CHASE_BET.format(
+                match_name=match_name, league_name=league_name, country=country, score=score,
+                score_36=state['36_score'], ht_score=state['ht_score']
+            ))
+
+def resolve_regular_bet(bet_info, match_name, league_name, country, final_score):
+    """Regular bets should have been resolved at HT, so reaching FT is an error"""
+    message = MSG_FT_REGULAR_UNRESOLVED.format(
+        match_name=match_name, league_name=league_name, country=country, score=final_score
+    )
+    return 'error', message
+
+def resolve_chase_bet(bet_info, match_name, league_name, country, final_score):
+    """Chase bets win if the final score matches the 80' score"""
+    chase_score = bet_info.get('80_score', '')
+    if final_score == chase_score:
+        message = MSG_CHASE_WON.format(
+            match_name=match_name, league_name=league_name, country=country, score=final_score,
+            score_36=bet_info['36_score'], ht_score=bet_info['ht_score']
+        )
+        return 'win', message
+    message = MSG_CHASE_LOST.format(
+        match_name=match_name, league_name=league_name, country=country, score=final_score,
+        score_80=chase_score, score_36=bet_info['36_score'], ht_score=bet_info['ht_score']
+    )
+    return 'loss', message
+
+def resolve_unknown_bet(bet_info, match_name, league_name, country, final_score):
+    """Unknown bet types are closed out as errors"""
+    message = MSG_FT_UNKNOWN_BET.format(
+        match_name=match_name, league_name=league_name, country=country, score=final_score,
+        bet_type=bet_info['bet_type']
+    )
+    return 'error', message
 
-def check_unresolved_bets():
-    """Check ALL unresolved bets regardless of match date"""
-    print("🔍 Checking unresolved bets...")
+BET_RESOLVERS = {
+    'regular': resolve_regular_bet,
+    'chase': resolve_chase_bet,
+}
+
+def load_resolvable_bets(now=None):
+    """Load unresolved bets old enough to have finished"""
+    now = now or datetime.utcnow()
+    return list(firebase_manager.stream_unresolved_bets(placed_before=now - RESOLVE_MIN_AGE))
+
+def check_unresolved_bets(bet_snapshots=None, now=None, live_ids=None):
+    """Check ALL unresolved bets regardless of match date; live_ids are fixture ids in this cycle's live feed"""
+    log.debug("🔍 Checking unresolved bets...")
     
-    # Get all unresolved bets
-    unresolved_bets = firebase_manager.get_unresolved_bets()
-    if not unresolved_bets:
-        print("✅ No unresolved bets found")
+    now = now or datetime.utcnow()
+    live_ids = live_ids or set()
+    if bet_snapshots is None:
+        bet_snapshots = load_resolvable_bets(now)
+    if not bet_snapshots:
+        log.debug("✅ No unresolved bets found")
+        return
+        
+    # The query already enforces RESOLVE_MIN_AGE; also skip bet types that need longer to reach FT
+    # (placed_at is an ISO string, so string comparison is time order)
+    min_age_cutoffs = {bet_type: (now - age).isoformat() for bet_type, age in BET_MIN_AGES.items()}
+    bet_snapshots = [
+        snap for snap in bet_snapshots
+        if snap.get('bet_type') not in min_age_cutoffs
+        or snap.get('placed_at') <= min_age_cutoffs[snap.get('bet_type')]
+    ]
+    if not bet_snapshots:
         return
+    stale_cutoff = (now - STALE_BET_AGE).isoformat()
         
-    match_ids = list(unresolved_bets.keys())
-    fixtures = get_fixtures_by_ids(match_ids)
+    # Matches still in this cycle's live feed are being played, so only look up the rest
+    match_ids = [snap.id for snap in bet_snapshots if snap.id not in live_ids]
+    fixtures, checked = get_fixtures_by_ids(match_ids)
+    resolution_ops = []
     
-    for match_id, bet_info in unresolved_bets.items():
+    for snap in bet_snapshots:
+        match_id = snap.id
         if match_id not in fixtures:
-            print(f"⚠️ Fixture {match_id} not found in finished matches")
+            # Matches that never report FT (postponed, abandoned, AET/PEN) would otherwise be polled forever.
+            # Only expire bets a successful lookup confirmed unfinished: a failed chunk or quota error proves
+            # nothing, and a match still in the live feed is never checked, so it is never expired
+            if match_id in checked and snap.get('placed_at') <= stale_cutoff:
+                bet_info = snap.to_dict()
+                log.warning("⚠️ Expiring bet %s - no FT result after %s", match_id, STALE_BET_AGE)
+                queue_telegram(MSG_BET_EXPIRED.format(
+                    match_name=bet_info.get('match_name', f"Match {match_id}"),
+                    league_name=bet_info.get('league', 'Unknown League'),
+                    country=bet_info.get('country', 'N/A'),
+                    hours=int(STALE_BET_AGE.total_seconds() // 3600)
+                ))
+                resolution_ops.extend(firebase_manager.resolution_ops(match_id, bet_info, 'expired'))
+            else:
+                log.debug("⚠️ Fixture %s not found in finished matches", match_id)
             continue
             
+        bet_info = snap.to_dict()
         match_data = fixtures[match_id]
         fixture = match_data['fixture']
         status = fixture['status']['short']
         
         # Only process finished matches
         if status != 'FT':
-            print(f"⚠️ Match {match_id} not finished (status: {status}), skipping")
+            log.debug("⚠️ Match %s not finished (status: %s), skipping", match_id, status)
             continue
             
         home_goals_ft = match_data['goals']['home'] or 0
@@ -339,82 +729,149 @@ def check_unresolved_bets():
         bet_type = bet_info['bet_type']
         country = bet_info.get('country', 'N/A')
         
-        outcome = None
-        message = ""
-        
-        # --- Resolution Logic ---
-        if bet_type == 'regular':
-            # This should have been resolved at HT
-            outcome = 'error'
-            message = f"⚠️ FT Result: {match_name}\n🏆 {league_name} ({country})\n🔢 Score: {final_score}\n❓ Regular bet was not resolved at HT. Marked as error."
-            
-        elif bet_type == 'chase':
-            # Get score at 80' from bet info
-            chase_score = bet_info.get('80_score', '')
-            # Win if final score matches 80' score
-            if final_score == chase_score:
-                outcome = 'win'
-                message = (
-                    f"✅ CHASE BET WON: {match_name}\n"
-                    f"🏆 {league_name} ({country})\n"
-                    f"🔢 Final Score: {final_score}\n"
-                    f"🎉 Same as 80' score\n"
-                    f"💡 Covered 36' loss ({bet_info['36_score']} -> {bet_info['ht_score']})"
-                )
-            else:
-                outcome = 'loss'
-                message = (
-                    f"❌ CHASE BET LOST: {match_name}\n"
-                    f"🏆 {league_name} ({country})\n"
-                    f"🔢 Final Score: {final_score} (was {chase_score} at 80')\n"
-                    f"📉 Score changed after 80'\n"
-                    f"💡 Failed to cover 36' loss ({bet_info['36_score']} -> {bet_info['ht_score']})"
-                )
-                
-        else:
-            # Handle unknown bet types
-            outcome = 'error'
-            message = f"⚠️ FT Result: {match_name}\n🏆 {league_name} ({country})\n🔢 Score: {final_score}\n❓ Unknown bet type: {bet_type}"
+        resolver = BET_RESOLVERS.get(bet_type, resolve_unknown_bet)
+        outcome, message = resolver(bet_info, match_name, league_name, country, final_score)
         
         if outcome:
-            send_telegram(message)
-            firebase_manager.move_to_resolved(match_id, bet_info, outcome)
-
-def run_bot_once():
-    """Run one complete cycle of the bot"""
-    print(f"\n⏰ [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting new cycle")
+            queue_telegram(message)
+            resolution_ops.extend(firebase_manager.resolution_ops(match_id, bet_info, outcome))
     
-    # Process live matches
-    live_matches = get_live_matches()
+    # Write every resolution from this pass in one batched commit
+    if resolution_ops:
+        firebase_manager.commit_batch(resolution_ops)
+
+def can_act_in_window(short, state):
+    """False when a match's cached state rules out any action in its upcoming 1H/2H window; unknown state may act"""
+    if state is None:
+        return True
+    if short == '1H':
+        return not state.get('36_bet_placed')
+    # The 80' chase is only placed after a lost 36' bet
+    return not state.get('80_bet_placed') and state.get('36_bet_won') is False
+
+def next_poll_interval(live_matches):
+    """Seconds until the next poll: just before the earliest upcoming 36'/80' window that can still act, within the poll bounds"""
+    wait = MAX_POLL_INTERVAL
     for match in live_matches:
-        process_match(match)
+        status = match['fixture']['status']
+        minute = status['elapsed']
+        if minute is None:
+            continue
+        short = status['short'].upper()
+        if short == '1H' and minute <= 37:
+            window_start = 35
+        elif short == '2H' and minute <= 81:
+            window_start = 79
+        else:
+            continue
+        if not can_act_in_window(short, firebase_manager.cached_state(match['fixture']['id'])):
+            continue
+        # elapsed is floored to whole minutes, so assume the match is at the end of it
+        wait = min(wait, max(0, window_start - minute - 1) * 60)
+    return max(MIN_POLL_INTERVAL, wait)
+
+# Bet resolution runs on its own thread so a rate-limited fixture lookup never delays the next live poll
+RESOLVER_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resolver")
+RESOLVE_STATE = {'future': None}
+
+def resolve_in_background(now, live_ids):
+    """Resolve finished bets off the cycle thread, then send their notifications"""
+    try:
+        check_unresolved_bets(None, now, live_ids)
+    except Exception as e:
+        log.error("❌ Unexpected error resolving bets: %s", e)
+    finally:
+        flush_telegram()
+
+def start_bet_resolution(now, live_ids):
+    """Start a background resolution pass unless the previous one is still running"""
+    future = RESOLVE_STATE['future']
+    if future is not None and not future.done():
+        log.info("⏳ Previous bet resolution still running, skipping this cycle")
+        return
+    RESOLVE_STATE['future'] = RESOLVER_EXECUTOR.submit(resolve_in_background, now, live_ids)
+
+def run_bot_once():
+    """Run one complete cycle of the bot; returns the number of seconds to wait before the next one"""
+    log.info("⏰ Starting new cycle")
+    live_matches = []
+    # One timestamp per cycle for bet ages and placed_at values
+    cycle_now = datetime.utcnow()
+    placed_at = cycle_now.isoformat()
     
-    # Check unresolved bets
-    check_unresolved_bets()
+    try:
+        live_matches = get_live_matches()
+        
+        # Resolving finished bets shares no state with live-match processing (regular bets only reach it
+        # an hour after placement, chase bets are never touched again live), and the cycle doesn't wait for it
+        start_bet_resolution(cycle_now, {str(m['fixture']['id']) for m in live_matches})
+        
+        # Only fixtures in a bet window can change state; prefetch theirs with one Firestore round trip
+        actionable_matches = [m for m in live_matches if is_actionable_match(m)]
+        if actionable_matches:
+            firebase_manager.get_tracked_matches([m['fixture']['id'] for m in actionable_matches])
+        
+        # Likewise read the bets awaiting an HT result in one round trip
+        ht_ids = [
+            str(m['fixture']['id']) for m in actionable_matches
+            if m['fixture']['status']['short'].upper() == 'HT'
+            and awaits_ht_result(firebase_manager.cached_state(m['fixture']['id']) or {})
+        ]
+        ht_bets = {}
+        if ht_ids:
+            found = firebase_manager.get_unresolved_bets_by_ids(ht_ids)
+            if found is not None:
+                ht_bets = {mid: found.get(mid) for mid in ht_ids}
+        
+        for match in actionable_matches:
+            process_match(match, ht_bets, placed_at)
+    finally:
+        # Deliver everything queued this cycle, even if processing failed part-way
+        flush_telegram()
     
-    print(f"✅ Cycle completed at {datetime.now().strftime('%H:%M:%S')}")
+    log.info("✅ Cycle completed")
+    return next_poll_interval(live_matches)
+
+HEALTH_CHECK_STATE = {'next_due': time.monotonic() + HEALTH_CHECK_INTERVAL}
 
 def health_check():
-    """Periodic health check notification"""
-    if datetime.now().minute % 30 == 0:  # Every 30 minutes
-        send_telegram(f"🤖 Bot is active | Last cycle: {datetime.now().strftime('%H:%M:%S')}")
+    """Periodic health check notification, sent once per HEALTH_CHECK_INTERVAL whenever cycles land"""
+    now = time.monotonic()
+    if now < HEALTH_CHECK_STATE['next_due']:
+        return
+    HEALTH_CHECK_STATE['next_due'] = now + HEALTH_CHECK_INTERVAL
+    send_telegram(f"🤖 Bot is active | Last cycle: {datetime.now().strftime('%H:%M:%S')}")
 
-if __name__ == "__main__":
-    print("🚀 Starting Football Betting Bot")
+def sleep_until_next_cycle(cycle_start, interval=POLL_INTERVAL):
+    """Sleep out the rest of the interval measured from cycle_start, so cycle time doesn't add drift"""
+    sleep_time = max(0, interval - (time.monotonic() - cycle_start))
+    log.info("💤 Sleeping for %.0f seconds...", sleep_time)
+    time.sleep(sleep_time)
+
+def run_forever():
+    """Run cycles forever, backing off on consecutive errors"""
+    log.info("🚀 Starting Football Betting Bot")
     cycle_count = 0
+    consecutive_errors = 0
     
     while True:
+        cycle_start = time.monotonic()
+        interval = POLL_INTERVAL
         try:
             cycle_count += 1
-            run_bot_once()
+            interval = run_bot_once()
             health_check()
+            consecutive_errors = 0
         except Exception as e:
-            error_msg = f"🔥 CRITICAL ERROR: {str(e)[:300]}"
-            print(error_msg)
+            error_msg = f"🔥 CRITICAL ERROR in cycle {cycle_count}: {str(e)[:300]}"
+            log.critical(error_msg)
             send_telegram(error_msg)
-            # Exponential backoff on errors
-            time.sleep(min(300, 5 * 2 ** cycle_count))
+            # Exponential backoff on consecutive errors, reset by the next successful cycle; added to the
+            # interval because sleep_until_next_cycle measures from cycle_start and would absorb a separate sleep
+            interval = POLL_INTERVAL + min(300, 5 * 2 ** consecutive_errors)
+            consecutive_errors += 1
         finally:
-            sleep_time = 90  # 1.5 minutes
-            print(f"💤 Sleeping for {sleep_time} seconds...")
-            time.sleep(sleep_time)
\ No newline at end of file
+            sleep_until_next_cycle(cycle_start, interval)
+
+if __name__ == "__main__":
+    run_forever()
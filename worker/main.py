@@ -1,20 +1,7 @@
-from bot import run_bot_once
-import time
-from datetime import datetime
-
-CHECK_INTERVAL = 90  # in seconds
+from bot import run_forever
 
 def main():
-    print("🚀 Bot worker started")
-
-    while True:
-        try:
-            run_bot_once()
-        except Exception as e:
-            print(f"[{datetime.now()}] ❌ Unexpected error in main loop: {e}")
-        finally:
-            print(f"[{datetime.now()}] 💤 Sleeping for {CHECK_INTERVAL} seconds...\n")
-            time.sleep(CHECK_INTERVAL)
+    run_forever()
 
 if __name__ == "__main__":
     main()